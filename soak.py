@@ -0,0 +1,314 @@
+"""
+Long-session soak test for the MHO Skill Timer.
+
+Simulates hours of timer key presses, profile switches and settings saves in
+accelerated time against the real overlay (Tk main loop, timer threads, icons).
+Saves go through the real settings window: it is opened with open_config_gui,
+its duration fields are edited and its Save button is invoked. Meanwhile it samples:
+  - traced Python memory (tracemalloc)
+  - thread count
+  - Tk widget count
+  - Tk image count (PhotoImage data lives in Tcl, invisible to tracemalloc)
+  - pending Tk `after` callbacks
+  - entries left in `active_timers`
+
+It fails (exit code 1) if any of them keeps growing over the session.
+No global keyboard hook is installed; key presses are injected through the same
+dispatch function the hotkeys call, and hotkey rebinding after a save is skipped.
+The config file is written to a temporary directory, so your own timer_config.txt
+is never touched.
+
+Usage:
+    python soak.py [--hours 8] [--speed 240] [--apm 40]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tkinter as tk
+import tracemalloc
+
+from PIL import Image
+
+# timer.py loads (or creates) its config file at import time, so switch to a
+# scratch directory first.
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+WORK_DIR = tempfile.mkdtemp(prefix="mho-soak-")
+os.chdir(WORK_DIR)
+sys.path.insert(0, SCRIPT_DIR)
+
+import timer  # noqa: E402
+
+# Simulated minutes between events. The settings window is opened one minute before
+# each save; the switch interval is not a divisor of the save interval, so saves
+# land on both profiles (and sometimes a switch happens while the window is open).
+SAVE_EVERY_MIN = 20
+PROFILE_SWITCH_EVERY_MIN = 7
+SAMPLE_EVERY_MIN = 5
+
+# Fraction of the session ignored while caches and allocators warm up
+WARMUP_FRACTION = 0.25
+
+# Allowed growth of the second half of the session over the first half
+MEMORY_SLACK_RATIO = 0.10
+MEMORY_SLACK_BYTES = 256 * 1024
+COUNT_SLACK = 2
+
+METRICS = ("memory", "threads", "widgets", "images", "after_callbacks", "active_timers")
+
+
+def write_soak_icons():
+    """
+    Writes the icons used by the soak config into the scratch directory and returns
+    their paths: a real PNG (decoded and resized), a missing file (placeholder) and a
+    file that isn't an image (error fallback), so every load_image branch is exercised.
+    """
+    icons = {
+        "png": os.path.join(WORK_DIR, "soak_icon.png"),
+        "missing": os.path.join(WORK_DIR, "missing_icon.png"),
+        "broken": os.path.join(WORK_DIR, "broken_icon.png"),
+        "default": timer.DEFAULT_ICON_PATH,
+    }
+    Image.new("RGB", (64, 64), "purple").save(icons["png"])
+    with open(icons["broken"], "wb") as f:
+        f.write(b"not a png")
+    return icons
+
+
+def write_soak_config(speed):
+    """
+    Writes a two-profile config whose durations are scaled down by `speed`, so timers
+    both finish naturally and get restarted during the accelerated session.
+    Returns the scaled durations as {profile: {key: duration}}.
+    """
+    icons = write_soak_icons()
+    profiles = {
+        timer.DEFAULT_PROFILE: [
+            ("q", 2.0, "png"),
+            ("w", 3.5, "png"),
+            ("e", 4.0, "missing"),
+            ("r", 4.5, "broken"),
+            ("t", 5.0, "default"),
+            ("y", 5.5, "png"),
+        ],
+        "soak": [
+            ("q", 12.0, "png"),
+            ("w", 0.0, "default"),
+            ("a", 8.0, "broken"),
+            ("s", 30.0, "missing"),
+        ],
+    }
+
+    durations = {
+        name: {
+            key: max(duration / speed, 0.05) if duration > 0 else 0.0
+            for key, duration, _ in configs
+        }
+        for name, configs in profiles.items()
+    }
+
+    with open(timer.CONFIG_FILE, "w") as f:
+        for name, configs in profiles.items():
+            if name != timer.DEFAULT_PROFILE:
+                f.write(f"---PROFILE::{name}---\n")
+            for key, _, _ in configs:
+                f.write(f"{key}::{durations[name][key]}\n")
+            f.write("---ICONS---\n")
+            for key, _, icon in configs:
+                f.write(f"{key}::{icons[icon]}\n")
+            if name == timer.DEFAULT_PROFILE:
+                f.write("---UTILITY_KEYS---\n")
+
+    timer.load_config()
+    return durations
+
+
+def count_widgets(widget):
+    """
+    Counts `widget` and all of its descendants.
+    """
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def take_sample():
+    """
+    Returns the current value of every soak metric. Must run in the main thread.
+    """
+    with timer.timer_lock:
+        active_timer_count = len(timer.active_timers)
+
+    return {
+        "memory": tracemalloc.get_traced_memory()[0],
+        "threads": threading.active_count(),
+        "widgets": count_widgets(timer.gui_root),
+        "images": len(timer.gui_root.image_names()),
+        "after_callbacks": len(
+            timer.gui_root.tk.splitlist(timer.gui_root.tk.call("after", "info"))
+        ),
+        "active_timers": active_timer_count,
+    }
+
+
+def find_growth(samples):
+    """
+    Compares the peak of every metric in the second half of the (post-warmup) session
+    against the first half. Returns a list of human readable failures.
+    """
+    steady = samples[int(len(samples) * WARMUP_FRACTION) :]
+    if len(steady) < 4:
+        return ["Not enough samples; run a longer session or lower --speed."]
+
+    first, second = steady[: len(steady) // 2], steady[len(steady) // 2 :]
+    failures = []
+
+    for metric in METRICS:
+        before = max(s[metric] for s in first)
+        after = max(s[metric] for s in second)
+        if metric == "memory":
+            limit = before * (1 + MEMORY_SLACK_RATIO) + MEMORY_SLACK_BYTES
+        else:
+            limit = before + COUNT_SLACK
+        if after > limit:
+            failures.append(f"{metric} grew from {before} to {after} (limit {limit:.0f})")
+
+    return failures
+
+
+def iter_widgets(widget):
+    """
+    Yields `widget` and all of its descendants.
+    """
+    yield widget
+    for child in widget.winfo_children():
+        yield from iter_widgets(child)
+
+
+def save_settings_window(original_durations):
+    """
+    Edits the duration fields of the open settings window and clicks its Save button.
+    Each timer gets its original duration, or 0 (disabled) with a 20% chance, so
+    disabled timers come back on later saves. Must run in the main thread.
+    """
+    window = timer.config_window
+    if not (window and window.winfo_exists()):
+        return
+
+    timer_frame = next(
+        w
+        for w in iter_widgets(window)
+        if isinstance(w, tk.LabelFrame) and w.cget("text") == "Timer Hotkeys"
+    )
+    rows = {}
+    for entry in timer_frame.winfo_children():
+        if isinstance(entry, tk.Entry):
+            info = entry.grid_info()
+            rows.setdefault(int(info["row"]), {})[int(info["column"])] = entry
+
+    for row in rows.values():
+        duration = original_durations.get(row[0].get(), 0.0)
+        value = duration if random.random() > 0.2 else 0.0
+        window.setvar(str(row[1].cget("textvariable")), str(value))
+
+    save_button = next(
+        w
+        for w in window.winfo_children()
+        if isinstance(w, tk.Button) and w.cget("text") == "Save"
+    )
+    save_button.invoke()
+
+
+def simulate_key_presses(stop_event, keys, interval):
+    """
+    Presses random timer keys from a worker thread, like the keyboard hook thread would.
+    """
+    while not stop_event.is_set():
+        timer.dispatch_timer_key(random.choice(keys))
+        time.sleep(random.uniform(0.5, 1.5) * interval)
+
+
+def run_soak(hours, speed, apm):
+    """
+    Runs the accelerated session and returns the process exit code.
+    """
+    original_durations = write_soak_config(speed)
+    tracemalloc.start()
+
+    # apply_and_restart ends with setup_hotkeys(); skip it so the soak never
+    # installs real global hotkeys (it is looked up at call time).
+    timer.setup_hotkeys = lambda: None
+
+    timer.create_overlay()
+    timer.sample_loop_lag()
+
+    root = timer.gui_root
+    real_minute = 60.0 / speed
+    session_minutes = int(hours * 60)
+    keys = sorted({key for configs, _ in timer.PROFILES.values() for key, _ in configs})
+
+    samples = []
+    stop_event = threading.Event()
+    presser = threading.Thread(
+        target=simulate_key_presses,
+        args=(stop_event, keys, 60.0 / apm / speed),
+        name="Soak-KeyPresses",
+        daemon=True,
+    )
+
+    edited_profile = [timer.ACTIVE_PROFILE]
+
+    def tick(minute=0):
+        if minute % SAMPLE_EVERY_MIN == 0:
+            sample = take_sample()
+            samples.append(sample)
+            print(
+                f"[{minute // 60:02d}h{minute % 60:02d}m] "
+                + "  ".join(f"{name}={sample[name]}" for name in METRICS)
+            )
+        if minute and minute % PROFILE_SWITCH_EVERY_MIN == 0:
+            timer.cycle_profile()
+        if minute % SAVE_EVERY_MIN == SAVE_EVERY_MIN - 1:
+            # The window edits the profile active when it opens
+            edited_profile[0] = timer.ACTIVE_PROFILE
+            timer.open_config_gui()
+        if minute and minute % SAVE_EVERY_MIN == 0:
+            save_settings_window(original_durations[edited_profile[0]])
+
+        if minute < session_minutes:
+            root.after(int(real_minute * 1000), tick, minute + 1)
+        else:
+            stop_event.set()
+            root.after(500, root.quit)
+
+    print(
+        f"Soak: {hours:g}h simulated at {speed:g}x "
+        f"(~{session_minutes * real_minute:.0f}s), {apm:g} presses/min"
+    )
+    presser.start()
+    root.after(0, tick)
+    root.mainloop()
+    presser.join(timeout=1.0)
+
+    lag = timer.get_loop_lag_percentiles()
+    if lag:
+        print("GUI loop lag (ms): " + ", ".join(f"{k}={v:.1f}" for k, v in lag.items()))
+
+    failures = find_growth(samples)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("PASS: no unbounded growth detected.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MHO Skill Timer soak test")
+    parser.add_argument("--hours", type=float, default=8.0, help="simulated session length")
+    parser.add_argument("--speed", type=float, default=240.0, help="time acceleration")
+    parser.add_argument("--apm", type=float, default=40.0, help="simulated key presses per minute")
+    args = parser.parse_args()
+
+    sys.exit(run_soak(args.hours, args.speed, args.apm))
@@ -0,0 +1,116 @@
+"""
+Reference reader for the live timer state published by `timer.py --state-file PATH`.
+
+The state file is a fixed-layout block that the overlay updates in place:
+
+    Header (16 bytes, little-endian)
+        4s  magic            b"MHOT"
+        H   layout version   1
+        H   slot count       number of used slots
+        Q   version          seqlock counter, odd while the overlay is writing
+
+    Slot (40 bytes each, 16 slots, directly after the header)
+        16s key              utf-8, NUL padded
+        d   duration         full timer duration in seconds
+        q   deadline         time.monotonic_ns() at which the timer ends
+        B   running          1 while the timer is counting down
+        7x  padding
+
+Reading is plain memory access on a shared mapping: no syscalls into the overlay
+process and no effect on its timing. A snapshot is consistent when the version is
+even and unchanged across the copy.
+
+Usage:
+    python state_reader.py [PATH] [--interval 0.1]
+"""
+
+import argparse
+import mmap
+import struct
+import sys
+import time
+
+STATE_MAGIC = b"MHOT"
+STATE_LAYOUT_VERSION = 1
+STATE_MAX_SLOTS = 16
+STATE_HEADER = struct.Struct("<4sHHQ")
+STATE_SLOT = struct.Struct("<16sdqB7x")
+
+
+def read_snapshot(state_map):
+    """
+    Returns a consistent list of {"key", "duration", "deadline_ns", "running"} dicts,
+    retrying while the overlay is in the middle of a write.
+    """
+    while True:
+        _, _, _, version = STATE_HEADER.unpack_from(state_map, 0)
+        if version % 2:
+            time.sleep(0)
+            continue
+
+        data = state_map[: STATE_HEADER.size + STATE_MAX_SLOTS * STATE_SLOT.size]
+        if STATE_HEADER.unpack_from(state_map, 0)[3] != version:
+            continue
+
+        magic, layout_version, slot_count, _ = STATE_HEADER.unpack_from(data, 0)
+        if magic != STATE_MAGIC or layout_version != STATE_LAYOUT_VERSION:
+            raise ValueError("Not an MHO timer state file (or unsupported version).")
+
+        slots = []
+        for slot in range(min(slot_count, STATE_MAX_SLOTS)):
+            key, duration, deadline_ns, running = STATE_SLOT.unpack_from(
+                data, STATE_HEADER.size + slot * STATE_SLOT.size
+            )
+            slots.append(
+                {
+                    "key": key.rstrip(b"\0").decode("utf-8", "replace"),
+                    "duration": duration,
+                    "deadline_ns": deadline_ns,
+                    "running": bool(running),
+                }
+            )
+        return slots
+
+
+def format_snapshot(slots):
+    """
+    Formats a snapshot as one line: remaining seconds for running timers, "-" otherwise.
+    """
+    now = time.monotonic_ns()
+    parts = []
+    for slot in slots:
+        if slot["running"]:
+            remaining = max(0.0, (slot["deadline_ns"] - now) / 1e9)
+            parts.append(f"{slot['key'].upper()}:{remaining:6.2f}")
+        else:
+            parts.append(f"{slot['key'].upper()}:{'-':>6}")
+    return "  ".join(parts)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print live MHO timer state")
+    parser.add_argument("path", nargs="?", default="timer_state.bin")
+    parser.add_argument("--interval", type=float, default=0.1, help="poll interval (s)")
+    args = parser.parse_args()
+
+    try:
+        with open(args.path, "rb") as f:
+            state_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as e:
+        print(f"Could not open state file '{args.path}': {e}")
+        sys.exit(1)
+
+    try:
+        while True:
+            try:
+                line = format_snapshot(read_snapshot(state_map))
+            except ValueError as e:
+                if STATE_HEADER.unpack_from(state_map, 0)[0] != b"\0" * 4:
+                    print(f"Could not read state file '{args.path}': {e}")
+                    sys.exit(1)
+                # All-zero header: the overlay has not published its layout yet
+                line = "Waiting for the overlay..."
+            print(line, end="\r", flush=True)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print()
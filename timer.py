@@ -1,11 +1,27 @@
 import os
 import sys
 import time
+import argparse
+import collections
+import itertools
+import logging
+import logging.handlers
+import mmap
+import queue
+import struct
 import threading
+import multiprocessing
+from types import MappingProxyType
+from multiprocessing import shared_memory
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import keyboard
-from PIL import Image, ImageTk
+from PIL import Image, ImageGrab, ImageTk
+
+try:
+    import numpy as np
+except ImportError:  # Optional: only needed for screen triggers
+    np = None
 
 
 def resource_path(relative_path):
@@ -30,15 +46,28 @@ CONFIG_FILE = "timer_config.txt"
 DEFAULT_ICON_PATH = resource_path("icons/default_icon.png")
 DEFAULT_COLOR = "cyan"
 
+# Logging: hot threads only enqueue records, a listener thread writes them
+LOG_FILE = "timer.log"
+LOG_MAX_BYTES = 1_000_000
+LOG_BACKUP_COUNT = 3
+LOG_RATE_LIMIT = 5  # warnings/errors per call site (or rate_key) ...
+LOG_RATE_WINDOW = 60.0  # ... per this many seconds
+log = logging.getLogger("mho_timer")
+log_listener = None
+
 # Default Utility Hotkeys
 CONFIG_KEY_OPEN_GUI = "f1"
 CONFIG_KEY_TOGGLE_ACTIVE = "f2"
+CONFIG_KEY_CYCLE_PROFILE = "f3"
 CONFIG_KEY_EXIT = "f10"
 
-# Default Timer Configuration: (Key, Duration)
+# Name of the profile stored in the unlabeled (top) block of the config file.
+DEFAULT_PROFILE = "default"
+
+# Built-in Timer Configuration of the default profile: (Key, Duration)
 TIMER_CONFIGS = [("q", 2.0), ("w", 3.5), ("e", 4.0), ("r", 4.5), ("t", 5.0), ("y", 5.5)]
 
-# Icon paths, keyed by timer key.
+# Built-in icon paths of the default profile, keyed by timer key.
 ICON_PATHS = {
     "q": DEFAULT_ICON_PATH,
     "w": DEFAULT_ICON_PATH,
@@ -48,42 +77,201 @@ ICON_PATHS = {
     "y": DEFAULT_ICON_PATH,
 }
 
+# Named profiles: name -> (timer configs, icon paths). Runtime code reads the
+# compiled RUNTIME_PLAN instead; these are the editable source of the plans.
+PROFILES = {DEFAULT_PROFILE: (TIMER_CONFIGS, ICON_PATHS)}
+ACTIVE_PROFILE = DEFAULT_PROFILE
+
+# Screen triggers: (key, (x, y, width, height), ready icon path, threshold).
+# A timer starts when its skill bar region stops matching the "ready" icon.
+SCREEN_TRIGGERS = []
+TRIGGER_RATE_HZ = 30
+TRIGGER_SAMPLE_SIZE = (8, 8)  # regions and icons are compared at this resolution
+TRIGGER_DEFAULT_THRESHOLD = 0.12  # max mean abs difference (0..1) that counts as ready
+TRIGGER_GRACE = 0.3  # seconds a started timer may run while its region still looks ready
+
+# Immutable runtime plan compiled from one profile's configuration (see compile_plan).
+# slots: key -> slot index among enabled timers, which is also its overlay column.
+RuntimePlan = collections.namedtuple(
+    "RuntimePlan",
+    ["configs", "icon_paths", "enabled", "slots", "durations", "label_width", "initial_text"],
+)
+PROFILE_PLANS = {}  # profile name -> RuntimePlan, replaced as a whole on every change
+RUNTIME_PLAN = None  # plan of the active profile, swapped atomically
+
 
 # Global status variables
 active_timers = {}
 timers_active = True
 timer_lock = threading.Lock()
-hotkey_listeners = []
+hotkey_listeners = []  # Handles returned by keyboard.add_hotkey
 
 # GUI variables
 gui_root = None
-timer_labels = {}
-timer_icons = {}
-timer_frames = {}
+profile_overlays = {}
 config_window = None
+icon_preview_refs = {}
 
 status_root = None
 status_label = None
 
+# Tk event-loop lag monitor: how late (ms) a periodic `after` callback actually runs
+LAG_SAMPLE_INTERVAL_MS = 100
+LAG_WARN_MS = 250
+loop_lag_samples = collections.deque(maxlen=600)  # last ~60s of samples
+loop_lag_lock = threading.Lock()
+
+# Keyboard hook mode: "thread" runs the `keyboard` hooks in this process,
+# "process" runs them in a child process that feeds a shared memory ring.
+HOOK_MODE = "thread"
+HOOK_RING_SLOTS = 1024
+HOOK_RING_COUNTER = struct.Struct("<Q")  # ring header (events written) / slot sequence
+HOOK_RING_EVENT = struct.Struct("<QqB23s")  # sequence, timestamp ns, key down, key name
+HOOK_BENCH_KEY = "f24"
+stop_hook_process = None
+hook_modifiers_held = set()  # modifier names currently down (hook process mode)
+
+# Memory-mapped live timer state for external readers (see state_reader.py).
+# Header: magic, layout version, slot count, seqlock version (odd while writing).
+# Slot: key (utf-8, NUL padded), duration s, deadline (time.monotonic_ns), running.
+STATE_MAGIC = b"MHOT"
+STATE_LAYOUT_VERSION = 1
+STATE_MAX_SLOTS = 16
+STATE_HEADER = struct.Struct("<4sHHQ")
+STATE_SEQ_OFFSET = 8
+STATE_SEQ = struct.Struct("<Q")
+STATE_SLOT = struct.Struct("<16sdqB7x")
+state_map = None
+state_slots = {}  # timer key -> slot index
+state_generation = 0  # bumped by every publish_state_layout, under state_lock
+state_lock = threading.Lock()
+
+# Coalesced GUI updates: slot -> newest pending callback (latest value wins)
+pending_gui_updates = {}
+gui_update_lock = threading.Lock()
+gui_flush_scheduled = False
+
+
+# --- LOGGING ---
+class RateLimitFilter(logging.Filter):
+    """
+    Lets at most LOG_RATE_LIMIT warnings/errors per key through every LOG_RATE_WINDOW
+    seconds and drops the rest, so a repeating failure (e.g. a broken icon path hit on
+    every rebuild) can't flood the log. The key is the record's `rate_key` extra, or
+    its call site. The next record let through reports how many were dropped.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+        self.windows = {}  # key -> [window start, records let through, records dropped]
+
+    def filter(self, record):
+        if record.levelno < logging.WARNING:
+            return True
+
+        key = getattr(record, "rate_key", None) or (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self.lock:
+            window = self.windows.get(key)
+            if window is None or now - window[0] >= LOG_RATE_WINDOW:
+                dropped = window[2] if window else 0
+                self.windows[key] = [now, 1, 0]
+            elif window[1] < LOG_RATE_LIMIT:
+                dropped = 0
+                window[1] += 1
+            else:
+                window[2] += 1
+                return False
+
+        if dropped:
+            record.msg = f"{record.msg} ({dropped} similar messages suppressed)"
+        return True
+
+
+class ThreadQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler for an in-process queue: enqueues the record as-is. The default
+    `prepare` formats the message up front (for pickling), which would put string
+    formatting back on the hotkey and timer threads.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def setup_logging(level=logging.INFO):
+    """
+    Routes the `log` logger through a queue: callers only enqueue records and a
+    QueueListener thread formats them and writes to the console and a rotating LOG_FILE.
+    """
+    global log_listener
+
+    if log_listener is not None:
+        return
+
+    formatter = logging.Formatter(
+        "%(asctime)s %(levelname)-7s [%(threadName)s] %(message)s"
+    )
+    handlers = [logging.StreamHandler()]
+    try:
+        handlers.append(
+            logging.handlers.RotatingFileHandler(
+                LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT
+            )
+        )
+    except OSError as e:
+        print(f"Could not open log file '{LOG_FILE}': {e}")
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = ThreadQueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter())
+
+    log.addHandler(queue_handler)
+    log.setLevel(level)
+    log.propagate = False
+
+    log_listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    log_listener.start()
+
+
+def stop_logging():
+    """
+    Writes out all queued records and stops the listener thread.
+    """
+    global log_listener
+
+    if log_listener is not None:
+        log_listener.stop()
+        log_listener = None
+
 
 # --- CONFIGURATION FILE HANDLING ---
 def load_config():
     """
-    Loads timer configurations, icon paths, and utility hotkeys from the CONFIG_FILE.
+    Loads timer configurations, icon paths, profiles, and utility hotkeys from the CONFIG_FILE.
     If the file is missing, it creates the default configuration using save_config().
-    It updates the global variables TIMER_CONFIGS, ICON_PATHS, and utility keys.
+    It updates the global variables PROFILES, SCREEN_TRIGGERS, and utility keys.
     """
-    global TIMER_CONFIGS, ICON_PATHS
-    global CONFIG_KEY_OPEN_GUI, CONFIG_KEY_TOGGLE_ACTIVE, CONFIG_KEY_EXIT
+    global PROFILES, ACTIVE_PROFILE, SCREEN_TRIGGERS
+    global CONFIG_KEY_OPEN_GUI, CONFIG_KEY_TOGGLE_ACTIVE, CONFIG_KEY_CYCLE_PROFILE
+    global CONFIG_KEY_EXIT
 
     if os.path.exists(CONFIG_FILE):
         try:
             with open(CONFIG_FILE, "r") as f:
-                new_configs = []
-                new_icon_paths = {}
+                # Profile name -> list of (key, duration) / dict of key -> icon path
+                new_configs = {DEFAULT_PROFILE: []}
+                new_icon_paths = {DEFAULT_PROFILE: {}}
+                new_triggers = []
                 lines = f.readlines()
 
                 config_section = "TIMERS"
+                current_profile = DEFAULT_PROFILE
 
                 for line in lines:
                     line = line.strip()
@@ -93,6 +281,18 @@ def load_config():
                     if line == "---UTILITY_KEYS---":
                         config_section = "UTILITY_KEYS"
                         continue
+                    if line == "---SCREEN_TRIGGERS---":
+                        config_section = "SCREEN_TRIGGERS"
+                        continue
+                    if line.startswith("---PROFILE::") and line.endswith("---"):
+                        # Profile block: ---PROFILE::name--- followed by its own
+                        # timers and (optionally) its own ---ICONS--- section.
+                        current_profile = line[len("---PROFILE::") : -3].strip()
+                        current_profile = current_profile or DEFAULT_PROFILE
+                        new_configs.setdefault(current_profile, [])
+                        new_icon_paths.setdefault(current_profile, {})
+                        config_section = "TIMERS"
+                        continue
 
                     if not line:
                         continue
@@ -106,13 +306,13 @@ def load_config():
                     if config_section == "TIMERS":
                         # Timer Configs: Key::Duration
                         try:
-                            new_configs.append((key, float(value)))
+                            new_configs[current_profile].append((key, float(value)))
                         except ValueError:
-                            print(f"Skipping invalid duration: {line}")
+                            log.warning("Skipping invalid duration: %s", line)
 
                     elif config_section == "ICONS":
                         # Icon Paths: Key::Path
-                        new_icon_paths[key] = value
+                        new_icon_paths[current_profile][key] = value
 
                     elif config_section == "UTILITY_KEYS":
                         # Utility Keys: Name::Key
@@ -120,41 +320,86 @@ def load_config():
                             CONFIG_KEY_OPEN_GUI = value.lower()
                         elif key == "toggle_active":
                             CONFIG_KEY_TOGGLE_ACTIVE = value.lower()
+                        elif key == "cycle_profile":
+                            CONFIG_KEY_CYCLE_PROFILE = value.lower()
                         elif key == "exit":
                             CONFIG_KEY_EXIT = value.lower()
 
-                if new_configs:
-                    TIMER_CONFIGS = new_configs
-
-                # Update ICON_PATHS using the loaded config keys, falling back to default icon
-                current_keys = [c[0] for c in TIMER_CONFIGS]
-                ICON_PATHS = {
-                    key: new_icon_paths.get(key, DEFAULT_ICON_PATH)
-                    for key in current_keys
-                }
-
-                if new_configs or new_icon_paths:
-                    print("--- Configuration loaded from file. ---")
+                    elif config_section == "SCREEN_TRIGGERS":
+                        # Screen Triggers: Key::X,Y,Width,Height::ReadyIconPath[::Threshold]
+                        try:
+                            x, y, width, height = (int(v) for v in value.split(","))
+                            threshold = (
+                                float(parts[3])
+                                if len(parts) > 3
+                                else TRIGGER_DEFAULT_THRESHOLD
+                            )
+                            new_triggers.append(
+                                (key, (x, y, width, height), parts[2], threshold)
+                            )
+                        except (ValueError, IndexError):
+                            log.warning("Skipping invalid screen trigger: %s", line)
+
+                new_profiles = {}
+                for name, configs in new_configs.items():
+                    if not configs:
+                        if name != DEFAULT_PROFILE:
+                            log.warning("Skipping empty profile: %s", name)
+                            continue
+                        # The default profile falls back to the built-in timers
+                        configs = PROFILES[DEFAULT_PROFILE][0]
+
+                    # Update icon paths using the loaded config keys, falling back to default icon
+                    new_profiles[name] = (
+                        configs,
+                        {
+                            key: new_icon_paths[name].get(key, DEFAULT_ICON_PATH)
+                            for key, _ in configs
+                        },
+                    )
+
+                PROFILES = new_profiles
+                SCREEN_TRIGGERS = new_triggers
+                if ACTIVE_PROFILE not in PROFILES:
+                    ACTIVE_PROFILE = DEFAULT_PROFILE
+
+                if any(new_configs.values()) or any(new_icon_paths.values()):
+                    log.info(
+                        "Configuration loaded from file (%d profile(s)).", len(PROFILES)
+                    )
         except Exception as e:
-            print(f"Error loading config file: {e}")
+            log.error("Error loading config file: %s", e)
     else:
         # Configuration file is MISSING: create the default one.
-        print(f"Configuration file '{CONFIG_FILE}' not found. Creating default config.")
+        log.info("Configuration file '%s' not found. Creating default config.", CONFIG_FILE)
         save_config()
 
+    compile_profiles()
+
 
-def save_config(new_configs=None, new_icon_paths=None, new_utility_keys=None):
+def save_config(
+    new_configs=None, new_icon_paths=None, new_utility_keys=None, profile=None
+):
     """
     Saves the current global configuration (or provided configurations) to the CONFIG_FILE.
-    It updates the global variables TIMER_CONFIGS, ICON_PATHS, and utility keys if new values are provided.
+    New timer configs and icon paths replace those of `profile` (default: the
+    ACTIVE_PROFILE); all other profiles are written back unchanged.
+    It updates the global variables PROFILES and utility keys if new values are provided.
     """
     # The fix for the SyntaxError: all globals that are *reassigned* must be declared here.
-    global TIMER_CONFIGS, ICON_PATHS
-    global CONFIG_KEY_OPEN_GUI, CONFIG_KEY_TOGGLE_ACTIVE, CONFIG_KEY_EXIT
+    global CONFIG_KEY_OPEN_GUI, CONFIG_KEY_TOGGLE_ACTIVE, CONFIG_KEY_CYCLE_PROFILE
+    global CONFIG_KEY_EXIT
 
-    # Use globals if no new config is provided (for initial startup save)
-    configs_to_save = new_configs if new_configs is not None else TIMER_CONFIGS
-    paths_to_save = new_icon_paths if new_icon_paths is not None else ICON_PATHS
+    if profile is None:
+        profile = ACTIVE_PROFILE
+
+    # Use the profile's current values if no new config is provided (for initial startup save)
+    current_configs, current_paths = PROFILES.get(profile, (TIMER_CONFIGS, ICON_PATHS))
+    configs_to_save = new_configs if new_configs is not None else current_configs
+    paths_to_save = new_icon_paths if new_icon_paths is not None else current_paths
+
+    profiles_to_save = dict(PROFILES)
+    profiles_to_save[profile] = (configs_to_save, paths_to_save)
 
     # Define utility keys to save
     if new_utility_keys:
@@ -164,20 +409,23 @@ def save_config(new_configs=None, new_icon_paths=None, new_utility_keys=None):
         utility_keys_to_save = {
             "open_gui": CONFIG_KEY_OPEN_GUI,
             "toggle_active": CONFIG_KEY_TOGGLE_ACTIVE,
+            "cycle_profile": CONFIG_KEY_CYCLE_PROFILE,
             "exit": CONFIG_KEY_EXIT,
         }
 
     try:
         with open(CONFIG_FILE, "w") as f:
-            # 1. Write Timer Configs section
-            for key, duration in configs_to_save:
+            default_configs, default_paths = profiles_to_save[DEFAULT_PROFILE]
+
+            # 1. Write Timer Configs section (default profile)
+            for key, duration in default_configs:
                 f.write(f"{key}::{duration}\n")
 
             # 2. Write Separator for Icons
             f.write("---ICONS---\n")
 
-            # 3. Write Icon Paths section
-            for key, path in paths_to_save.items():
+            # 3. Write Icon Paths section (default profile)
+            for key, path in default_paths.items():
                 f.write(f"{key}::{path}\n")
 
             # 4. Write Separator for Utility Keys
@@ -187,25 +435,100 @@ def save_config(new_configs=None, new_icon_paths=None, new_utility_keys=None):
             for name, key in utility_keys_to_save.items():
                 f.write(f"{name}::{key}\n")
 
-        print("--- Configuration saved to file. ---")
+            # 6. Write Screen Triggers (only if configured)
+            if SCREEN_TRIGGERS:
+                f.write("---SCREEN_TRIGGERS---\n")
+                for key, (x, y, width, height), path, threshold in SCREEN_TRIGGERS:
+                    f.write(f"{key}::{x},{y},{width},{height}::{path}::{threshold}\n")
+
+            # 7. Write every additional profile as its own block
+            for profile_name, (configs, paths) in profiles_to_save.items():
+                if profile_name == DEFAULT_PROFILE:
+                    continue
+                f.write(f"---PROFILE::{profile_name}---\n")
+                for key, duration in configs:
+                    f.write(f"{key}::{duration}\n")
+                f.write("---ICONS---\n")
+                for key, path in paths.items():
+                    f.write(f"{key}::{path}\n")
+
+        log.info("Configuration saved to file.")
 
         # Update global variables after successful save if new configs were provided
         if new_configs is not None:
-            TIMER_CONFIGS = new_configs
-            ICON_PATHS = paths_to_save
+            PROFILES[profile] = (new_configs, paths_to_save)
+            compile_profiles()
 
         # Update global utility keys if new ones were provided
         if new_utility_keys:
             CONFIG_KEY_OPEN_GUI = new_utility_keys["open_gui"]
             CONFIG_KEY_TOGGLE_ACTIVE = new_utility_keys["toggle_active"]
+            CONFIG_KEY_CYCLE_PROFILE = new_utility_keys["cycle_profile"]
             CONFIG_KEY_EXIT = new_utility_keys["exit"]
 
     except Exception as e:
-        print(f"Error saving config file: {e}")
+        log.error("Error saving config file: %s", e)
+
+
+def compile_plan(configs, icon_paths):
+    """
+    Compiles one profile's raw timer configs and icon paths into an immutable
+    RuntimePlan: enabled timers (duration > 0), their slots/columns, durations, label
+    width and preformatted initial texts. The runtime reads only from the plan and
+    never re-derives any of this from the raw configuration.
+    """
+    enabled = tuple((key, duration) for key, duration in configs if duration > 0)
+
+    # Calculate width based on the maximum duration string length
+    max_duration_digits = (
+        len(f"{max(duration for _, duration in enabled):.2f}") if enabled else 5
+    )
+
+    return RuntimePlan(
+        configs=tuple(configs),
+        icon_paths=MappingProxyType(
+            {key: icon_paths.get(key, DEFAULT_ICON_PATH) for key, _ in configs}
+        ),
+        enabled=enabled,
+        slots=MappingProxyType({key: i for i, (key, _) in enumerate(enabled)}),
+        durations=MappingProxyType(dict(enabled)),
+        label_width=max_duration_digits + 1,
+        initial_text=MappingProxyType(
+            {key: f"{duration:.2f}" for key, duration in enabled}
+        ),
+    )
 
 
-# Load the config immediately at startup
-load_config()
+def compile_profiles():
+    """
+    Recompiles the plans of all profiles after a configuration change. PROFILE_PLANS is
+    replaced as a whole, so readers never see a half-updated set. The active
+    RUNTIME_PLAN is swapped by `activate_profile` together with its overlay.
+    """
+    global PROFILE_PLANS, RUNTIME_PLAN
+
+    PROFILE_PLANS = {
+        name: compile_plan(configs, icon_paths)
+        for name, (configs, icon_paths) in PROFILES.items()
+    }
+    if RUNTIME_PLAN is None:
+        RUNTIME_PLAN = PROFILE_PLANS[ACTIVE_PROFILE]
+
+
+# Child processes (the keyboard hook) re-run this module before freeze_support() or
+# the spawn bootstrap take over; in the PyInstaller exe even as __main__, and before
+# parent_process() is set. Only the overlay process may log to LOG_FILE or load
+# (and possibly create) the config.
+IS_CHILD_PROCESS = (
+    multiprocessing.parent_process() is not None
+    or "--multiprocessing-fork" in sys.argv
+)
+
+# Start logging (not when imported by tools), then load the config immediately at startup
+if not IS_CHILD_PROCESS:
+    if __name__ == "__main__":
+        setup_logging()
+    load_config()
 
 # --- 2. GUI OVERLAY & STATUS WINDOW SETUP ---
 
@@ -252,20 +575,116 @@ def update_status_indicator():
             text = "X"
             color = "red"
 
+        post_gui_update(
+            (status_label, "text"), lambda: status_label.config(text=text, fg=color)
+        )
+
+
+def post_gui_update(slot, callback):
+    """
+    Thread-safe, latest-value-wins replacement for `gui_root.after(0, callback)`.
+    Every `slot` (e.g. a widget and the property being changed) holds at most one pending
+    callback and posting again replaces it. Only one flush is queued in Tk at a time, so
+    when the main loop stalls only the newest state per slot is applied afterwards and
+    the backlog never grows.
+    """
+    global gui_flush_scheduled
+
+    with gui_update_lock:
+        # Re-insert so the slot order follows the order of the latest updates
+        pending_gui_updates.pop(slot, None)
+        pending_gui_updates[slot] = callback
+        if gui_flush_scheduled:
+            return
+        gui_flush_scheduled = True
+
+    try:
+        gui_root.after(0, flush_gui_updates)
+    except RuntimeError:
+        with gui_update_lock:
+            gui_flush_scheduled = False
+
+
+def flush_gui_updates():
+    """
+    Applies all pending coalesced GUI updates. Runs in the main thread.
+    """
+    global gui_flush_scheduled
+
+    with gui_update_lock:
+        updates = list(pending_gui_updates.values())
+        pending_gui_updates.clear()
+        gui_flush_scheduled = False
+
+    for callback in updates:
         try:
-            gui_root.after(0, lambda: status_label.config(text=text, fg=color))
-        except RuntimeError:
+            callback()
+        except tk.TclError:
+            # The widget was destroyed by a rebuild after the update was posted
             pass
 
 
-def load_image(key, color):
+def sample_loop_lag(expected=None):
+    """
+    Re-schedules itself every LAG_SAMPLE_INTERVAL_MS and records how much later than
+    `expected` it actually ran, i.e. how long the Tk main loop was busy or stalled.
+    """
+    now = time.perf_counter()
+    if expected is not None:
+        lag_ms = max(0.0, (now - expected) * 1000.0)
+        with loop_lag_lock:
+            loop_lag_samples.append(lag_ms)
+        if lag_ms >= LAG_WARN_MS:
+            log.warning("GUI main loop stalled for %.0f ms", lag_ms)
+
+    try:
+        gui_root.after(
+            LAG_SAMPLE_INTERVAL_MS,
+            sample_loop_lag,
+            now + LAG_SAMPLE_INTERVAL_MS / 1000.0,
+        )
+    except (RuntimeError, tk.TclError):
+        pass
+
+
+def get_loop_lag_percentiles(percentiles=(50, 95, 99)):
+    """
+    Returns the main loop lag percentiles (and max) in milliseconds over the recent
+    samples, e.g. {"p50": 0.4, "p95": 1.2, "p99": 15.8, "max": 31.0}.
+    Returns an empty dict before the first sample.
+    """
+    with loop_lag_lock:
+        samples = list(loop_lag_samples)
+
+    return compute_percentiles(samples, percentiles)
+
+
+def compute_percentiles(samples, percentiles=(50, 95, 99)):
+    """
+    Returns the nearest-rank percentiles (and max) of `samples` as a dict,
+    e.g. {"p50": ..., "p95": ..., "p99": ..., "max": ...}. Empty input gives {}.
+    """
+    samples = sorted(samples)
+    if not samples:
+        return {}
+
+    result = {
+        f"p{p}": samples[min(len(samples) - 1, round(p / 100 * (len(samples) - 1)))]
+        for p in percentiles
+    }
+    result["max"] = samples[-1]
+    return result
+
+
+def load_image(key, color, icon_paths):
     """
     Loads the icon image associated with a timer key. If the path is the default
     or the file is not found, it generates a solid-colored placeholder image.
     The image is resized and converted to a Tkinter PhotoImage object.
+    `icon_paths` is the key -> path mapping of the profile the icon belongs to.
     """
     # Get the key-specific path
-    file_path = ICON_PATHS.get(key, DEFAULT_ICON_PATH)
+    file_path = icon_paths.get(key, DEFAULT_ICON_PATH)
 
     try:
         # Check if the path points to the bundled default icon or is invalid
@@ -281,16 +700,97 @@ def load_image(key, color):
 
         return ImageTk.PhotoImage(img)
     except Exception as e:
-        print(f"Error loading image {file_path}: {e}")
+        log.error(
+            "Error loading image %s: %s", file_path, e, extra={"rate_key": file_path}
+        )
         # Fallback to a solid red placeholder on error
         return ImageTk.PhotoImage(Image.new("RGB", ICON_SIZE, "red"))
 
 
+def build_profile_overlay(root, plan):
+    """
+    Builds the complete, resident set of overlay widgets for one profile's RuntimePlan:
+    a container frame holding one (initially hidden) icon + label frame per enabled
+    timer, and the decoded icon images. The container is not gridded;
+    `activate_profile` shows it.
+    """
+    overlay = {
+        "container": tk.Frame(root, bg="#010101"),
+        "plan": plan,
+        "frames": {},
+        "labels": {},
+        "icons": {},
+    }
+
+    for key, _ in plan.enabled:
+        timer_frame = tk.Frame(overlay["container"], bg="#010101")
+        timer_frame.grid(row=0, column=plan.slots[key], padx=10, pady=5)
+        overlay["frames"][key] = timer_frame
+
+        # Load image for the icon label
+        photo_image = load_image(key, color=DEFAULT_COLOR, icon_paths=plan.icon_paths)
+
+        icon_label = tk.Label(timer_frame, image=photo_image, bg="#010101")
+        icon_label.grid(row=0, column=0, pady=(0, 2))
+        overlay["icons"][key] = photo_image  # Store image reference
+
+        number_label = tk.Label(
+            timer_frame,
+            text=plan.initial_text[key],
+            font=("Courier", 14, "normal"),
+            fg=DEFAULT_COLOR,
+            bg="#010101",
+            width=plan.label_width,
+        )
+        number_label.grid(row=1, column=0)
+        overlay["labels"][key] = number_label
+
+        # Initially hide the timer
+        timer_frame.grid_forget()
+
+    return overlay
+
+
+def activate_profile(name):
+    """
+    Makes the prebuilt overlay of profile `name` the visible one and its plan the
+    RUNTIME_PLAN. This is a pointer swap: the widgets, icons and plan already exist,
+    so no file is read and no image is decoded. Must run in the main (Tk) thread.
+    """
+    global ACTIVE_PROFILE, RUNTIME_PLAN
+
+    overlay = profile_overlays[name]
+    plan = overlay["plan"]
+    previous = profile_overlays.get(ACTIVE_PROFILE)
+    if previous is not None and previous is not overlay:
+        previous["container"].grid_forget()
+
+    # Reset any timer left visible from the last time this profile was active
+    for key, frame in overlay["frames"].items():
+        frame.grid_forget()
+        overlay["labels"][key].config(text=plan.initial_text[key], fg=DEFAULT_COLOR)
+    overlay["container"].grid(row=0, column=0, padx=5, pady=5)
+
+    ACTIVE_PROFILE = name
+    RUNTIME_PLAN = plan
+
+    publish_state_layout()
+
+
+def destroy_profile_overlays():
+    """
+    Destroys the resident overlay widgets of every profile (before a full rebuild).
+    """
+    for overlay in profile_overlays.values():
+        overlay["container"].destroy()
+    profile_overlays.clear()
+
+
 def create_overlay():
     """
     Initializes the main Tkinter window (the transparent overlay), sets its properties
-    (always-on-top, transparent background), and creates the label/icon elements
-    for all configured timers, INITIALLY SKIPPING ANY TIMER WITH DURATION <= 0.
+    (always-on-top, transparent background), and prebuilds the label/icon elements of
+    every profile, SKIPPING ANY TIMER WITH DURATION <= 0. Only the active profile is shown.
     """
     global gui_root
 
@@ -308,100 +808,42 @@ def create_overlay():
     root.wm_attributes("-transparentcolor", "#010101")
     root.geometry(f"+700+880")
 
-    main_timer_frame = tk.Frame(root, bg="#010101")
-    main_timer_frame.grid(row=0, column=0, padx=5, pady=5)
+    for name, plan in PROFILE_PLANS.items():
+        if name not in profile_overlays:
+            profile_overlays[name] = build_profile_overlay(root, plan)
 
-    # Filter out zero/negative duration timers for display and size calculation
-    valid_configs = [c for c in TIMER_CONFIGS if c[1] > 0]
+    activate_profile(ACTIVE_PROFILE)
 
-    # Calculate width based on the maximum duration string length
-    max_duration_digits = (
-        len(f"{max(c[1] for c in valid_configs):.2f}") if valid_configs else 5
-    )
-
-    for i, (key, duration) in enumerate(TIMER_CONFIGS):
-
-        # --- MODIFICATION: Skip if duration is 0 or less ---
-        if duration <= 0:
-            # Ensure any old reference to this key's frame is cleared, in case of restart
-            if key in timer_frames:
-                timer_frames[key].destroy()
-                del timer_frames[key]
-                if key in timer_labels:
-                    del timer_labels[key]
-                if key in timer_icons:
-                    del timer_icons[key]
-            continue
-        # --------------------------------------------------
-
-        # Find the correct column index among only the valid timers
-        try:
-            config_index = [c[0] for c in valid_configs].index(key)
-        except ValueError:
-            # Should not happen if the check above passed, but as a safeguard
-            continue
-
-        timer_frame = tk.Frame(main_timer_frame, bg="#010101")
-        timer_frame.grid(row=0, column=config_index, padx=10, pady=5)
-        timer_frames[key] = timer_frame
-
-        # Load image for the icon label
-        photo_image = load_image(key, color=DEFAULT_COLOR)
-
-        icon_label = tk.Label(timer_frame, image=photo_image, bg="#010101")
-        icon_label.grid(row=0, column=0, pady=(0, 2))
-        timer_icons[key] = photo_image  # Store image reference
-
-        number_label = tk.Label(
-            timer_frame,
-            text=f"{duration:.2f}",
-            font=("Courier", 14, "normal"),
-            fg=DEFAULT_COLOR,
-            bg="#010101",
-            width=max_duration_digits + 1,
-        )
-        number_label.grid(row=1, column=0)
-        timer_labels[key] = number_label
-
-        # Initially hide the timer
-        timer_frame.grid_forget()
-
-    if gui_root.state() != "normal" and not timer_frames:
+    if gui_root.state() != "normal" and not RUNTIME_PLAN.enabled:
         gui_root.withdraw()
 
     create_status_window()
 
 
-def update_gui_text(key, text, color=None):
+def update_gui_text(key, text, color=None, overlay=None):
     """
     Thread-safe function to update the overlay text and color for a specific key's label.
     It uses `gui_root.after` to schedule the update in the main thread.
     It also ensures the timer frame is visible (gridded).
+    `overlay` defaults to the overlay of the active profile.
     """
-    if key in timer_labels:
+    if overlay is None:
+        overlay = profile_overlays.get(ACTIVE_PROFILE)
+        if overlay is None:
+            return
+
+    if key in overlay["labels"]:
         # Use default color unless specified otherwise
         color = color if color else DEFAULT_COLOR
-
-        try:
-            gui_root.after(0, lambda: timer_labels[key].config(text=text, fg=color))
-            # Find index by key and grid the frame
-
-            # Use the list of currently displayed (valid) timer keys for correct column index
-            valid_keys = [c[0] for c in TIMER_CONFIGS if c[1] > 0]
-            config_index = valid_keys.index(key)
-
-            gui_root.after(
-                0,
-                lambda: timer_frames[key].grid(
-                    row=0, column=config_index, padx=10, pady=5
-                ),
-            )
-        except RuntimeError:
-            pass
-        except ValueError:
-            # This handles the case where key is valid but duration was set to <= 0
-            # and thus the frame doesn't exist. No action needed, just skip.
-            pass
+        label = overlay["labels"][key]
+        frame = overlay["frames"][key]
+        config_index = overlay["plan"].slots[key]
+
+        post_gui_update((label, "text"), lambda: label.config(text=text, fg=color))
+        post_gui_update(
+            (frame, "grid"),
+            lambda: frame.grid(row=0, column=config_index, padx=10, pady=5),
+        )
 
 
 # --- 3. TIMER & VISIBILITY FUNCTIONS ---
@@ -417,13 +859,103 @@ def check_visibility():
         # Check if ANY thread in active_timers dictionary is alive
         is_any_timer_active = any(t.is_alive() for t in active_timers.values())
 
-    try:
-        if is_any_timer_active:
-            gui_root.after(0, gui_root.deiconify)
-        else:
-            gui_root.after(0, gui_root.withdraw)
-    except RuntimeError:
-        pass
+    if is_any_timer_active:
+        post_gui_update((gui_root, "state"), gui_root.deiconify)
+    else:
+        post_gui_update((gui_root, "state"), gui_root.withdraw)
+
+
+def open_state_file(path):
+    """
+    Creates (or truncates) the memory-mapped state file at `path` and publishes the
+    current timer layout into it. External tools can then poll it without touching
+    this process; see state_reader.py for the layout and a reference reader.
+    """
+    global state_map
+
+    size = STATE_HEADER.size + STATE_MAX_SLOTS * STATE_SLOT.size
+    with open(path, "w+b") as f:
+        f.truncate(size)
+        state_map = mmap.mmap(f.fileno(), size)
+
+    STATE_HEADER.pack_into(state_map, 0, STATE_MAGIC, STATE_LAYOUT_VERSION, 0, 0)
+    publish_state_layout()
+    log.info("Publishing timer state to '%s'", path)
+
+
+def write_state(write):
+    """
+    Runs `write(state_map)` as one seqlock write: the version is odd while the block is
+    being changed and even again afterwards, so readers can detect torn snapshots.
+    """
+    with state_lock:
+        version = STATE_SEQ.unpack_from(state_map, STATE_SEQ_OFFSET)[0]
+        STATE_SEQ.pack_into(state_map, STATE_SEQ_OFFSET, version + 1)
+        write(state_map)
+        STATE_SEQ.pack_into(state_map, STATE_SEQ_OFFSET, version + 2)
+
+
+def publish_state_layout():
+    """
+    Writes one slot per enabled timer of the active profile (all not running) into
+    the state file and starts a new layout generation. Called whenever the active
+    configuration changes.
+    """
+    if state_map is None:
+        return
+
+    enabled = RUNTIME_PLAN.enabled[:STATE_MAX_SLOTS] if RUNTIME_PLAN else ()
+
+    def write(buf):
+        global state_generation
+        state_generation += 1
+        state_slots.clear()
+        for slot in range(STATE_MAX_SLOTS):
+            key, duration = enabled[slot] if slot < len(enabled) else ("", 0.0)
+            STATE_SLOT.pack_into(
+                buf,
+                STATE_HEADER.size + slot * STATE_SLOT.size,
+                key.encode("utf-8")[:16],
+                duration,
+                0,
+                False,
+            )
+            if key:
+                state_slots[key] = slot
+        STATE_HEADER.pack_into(
+            buf,
+            0,
+            STATE_MAGIC,
+            STATE_LAYOUT_VERSION,
+            len(enabled),
+            STATE_SEQ.unpack_from(buf, STATE_SEQ_OFFSET)[0],
+        )
+
+    write_state(write)
+
+
+def publish_timer_state(key, duration, deadline_ns, running, generation):
+    """
+    Updates the state file slot of `key` (if state publishing is enabled).
+
+    `generation` is the state_generation the timer was started in. The check and the
+    slot lookup happen under `state_lock`, since publish_state_layout may swap the
+    layout concurrently; the write is skipped if the layout changed since (e.g. to a
+    profile with a same-named timer) or `key` has no slot.
+    """
+    if state_map is None:
+        return
+
+    def write(buf):
+        slot = state_slots.get(key)
+        if generation != state_generation or slot is None:
+            return
+        offset = STATE_HEADER.size + slot * STATE_SLOT.size
+        STATE_SLOT.pack_into(
+            buf, offset, key.encode("utf-8")[:16], duration, deadline_ns, running
+        )
+
+    write_state(write)
 
 
 def run_timer(duration, key, thread_instance):
@@ -436,41 +968,86 @@ def run_timer(duration, key, thread_instance):
     start_time = time.time()
     active_color = DEFAULT_COLOR
 
+    # Bind to the overlay of the profile this timer was started in, so a profile
+    # switch never redirects its updates onto another profile's widgets.
+    overlay = profile_overlays.get(ACTIVE_PROFILE)
+    if overlay is None:
+        return
+    labels, frames = overlay["labels"], overlay["frames"]
+    deadline_ns = time.monotonic_ns() + int(duration * 1e9)
+    publish_timer_state(
+        key, duration, deadline_ns, True, thread_instance.state_generation
+    )
+
     # Initial color for a fresh timer remains yellow
-    if key in timer_labels:  # Only update if the label was created (duration > 0)
-        update_gui_text(key, f"{duration:.2f}", "yellow")
+    if key in labels:  # Only update if the label was created (duration > 0)
+        update_gui_text(key, f"{duration:.2f}", "yellow", overlay)
 
     while (time.time() - start_time) < duration:
         # Check if a restart/cleanup signal was sent
         if hasattr(thread_instance, "stop_signal") and thread_instance.stop_signal:
+            if getattr(thread_instance, "hide_on_stop", False):
+                # Cancelled (see stop_timer): hide the element
+                if key in frames:
+                    post_gui_update((frames[key], "grid"), frames[key].grid_forget)
+                return
+
             # When stopped, reset the display to full duration in yellow
-            try:
-                full_duration = next(c[1] for c in TIMER_CONFIGS if c[0] == key)
-                if key in timer_labels:
-                    update_gui_text(key, f"{full_duration:.2f}", "yellow")
-            except StopIteration:
-                pass
+            full_text = overlay["plan"].initial_text.get(key)
+            if full_text is not None:
+                update_gui_text(key, full_text, "yellow", overlay)
             return
 
         remaining = duration - (time.time() - start_time)
         display_text = f"{remaining:.2f}"
-        if key in timer_labels:  # Only update if the label was created (duration > 0)
-            update_gui_text(key, display_text, active_color)
+        if key in labels:  # Only update if the label was created (duration > 0)
+            update_gui_text(key, display_text, active_color, overlay)
         time.sleep(0.01)
 
     # Timer finished: hide the element
-    if key in timer_frames:  # Only try to hide if the frame was created
-        try:
-            gui_root.after(0, lambda: timer_frames[key].grid_forget())
-        except RuntimeError:
-            pass
+    if key in frames:  # Only try to hide if the frame was created
+        post_gui_update((frames[key], "grid"), frames[key].grid_forget)
 
     with timer_lock:
-        if key in active_timers:
+        # Only forget this thread; a restart may already have replaced it
+        if active_timers.get(key) is thread_instance:
             del active_timers[key]
+            publish_timer_state(
+                key, duration, deadline_ns, False, thread_instance.state_generation
+            )
     check_visibility()
 
 
+def stop_timer(key):
+    """
+    Cancels the running timer for the given key (if any) and hides its element.
+    """
+    with timer_lock:
+        t = active_timers.pop(key, None)
+        if t and t.is_alive():
+            t.hide_on_stop = True
+            t.stop_signal = True
+
+    if t:
+        publish_timer_state(
+            key, RUNTIME_PLAN.durations.get(key, 0.0), 0, False, t.state_generation
+        )
+        check_visibility()
+
+
+def stop_all_timers():
+    """
+    Signals every running timer thread to stop and removes all of them from
+    `active_timers`, so stopped threads never accumulate there (e.g. for keys that
+    no longer exist after a save or a profile switch).
+    """
+    with timer_lock:
+        for t in active_timers.values():
+            if t and t.is_alive():
+                t.stop_signal = True
+        active_timers.clear()
+
+
 def start_timer(key, duration):
     """
     Stops any currently running timer for the given key and immediately starts a new timer
@@ -496,6 +1073,8 @@ def start_timer(key, duration):
         # Create new thread instance
         t = threading.Thread(target=run_timer, args=(duration, key, None))
         t.stop_signal = False
+        t.started_at = time.monotonic()
+        t.state_generation = state_generation
         t.name = f"Timer-{key.upper()}"
         t.daemon = True
 
@@ -505,23 +1084,317 @@ def start_timer(key, duration):
         active_timers[key] = t
         t.start()
 
-    if gui_root:
-        try:
-            gui_root.after(0, gui_root.deiconify)
+    overlay = profile_overlays.get(ACTIVE_PROFILE)
+    if gui_root and overlay and key in overlay["frames"]:
+        post_gui_update((gui_root, "state"), gui_root.deiconify)
 
-            # Find index by key and grid the frame to ensure correct order
-            # Must use the list of valid keys for correct column index
-            valid_keys = [c[0] for c in TIMER_CONFIGS if c[1] > 0]
-            config_index = valid_keys.index(key)
+        # Grid the frame in its column to ensure correct order
+        frame = overlay["frames"][key]
+        config_index = overlay["plan"].slots[key]
+        post_gui_update(
+            (frame, "grid"),
+            lambda: frame.grid(row=0, column=config_index, padx=10, pady=5),
+        )
 
-            gui_root.after(
-                0,
-                lambda: timer_frames[key].grid(
-                    row=0, column=config_index, padx=10, pady=5
-                ),
+
+if sys.platform == "win32":
+    # GDI prototypes for grab_screen. Handles must be declared as such, the ctypes
+    # default (int) would truncate them on 64-bit Windows.
+    import ctypes
+    from ctypes import wintypes
+
+    class BITMAPINFOHEADER(ctypes.Structure):
+        _fields_ = [
+            ("biSize", wintypes.DWORD),
+            ("biWidth", wintypes.LONG),
+            ("biHeight", wintypes.LONG),
+            ("biPlanes", wintypes.WORD),
+            ("biBitCount", wintypes.WORD),
+            ("biCompression", wintypes.DWORD),
+            ("biSizeImage", wintypes.DWORD),
+            ("biXPelsPerMeter", wintypes.LONG),
+            ("biYPelsPerMeter", wintypes.LONG),
+            ("biClrUsed", wintypes.DWORD),
+            ("biClrImportant", wintypes.DWORD),
+        ]
+
+    SRCCOPY = 0x00CC0020
+    DPI_AWARENESS_CONTEXT_PER_MONITOR_AWARE = -3
+    user32 = ctypes.WinDLL("user32")
+    gdi32 = ctypes.WinDLL("gdi32")
+    # Windows 10 1607+; on older systems captures stay DPI-virtualized, as in ImageGrab
+    SetThreadDpiAwarenessContext = getattr(user32, "SetThreadDpiAwarenessContext", None)
+    if SetThreadDpiAwarenessContext:
+        SetThreadDpiAwarenessContext.argtypes = [ctypes.c_void_p]
+        SetThreadDpiAwarenessContext.restype = ctypes.c_void_p
+    user32.GetDC.argtypes = [wintypes.HWND]
+    user32.GetDC.restype = wintypes.HDC
+    user32.ReleaseDC.argtypes = [wintypes.HWND, wintypes.HDC]
+    gdi32.CreateCompatibleDC.argtypes = [wintypes.HDC]
+    gdi32.CreateCompatibleDC.restype = wintypes.HDC
+    gdi32.CreateCompatibleBitmap.argtypes = [wintypes.HDC, ctypes.c_int, ctypes.c_int]
+    gdi32.CreateCompatibleBitmap.restype = wintypes.HBITMAP
+    gdi32.SelectObject.argtypes = [wintypes.HDC, wintypes.HGDIOBJ]
+    gdi32.SelectObject.restype = wintypes.HGDIOBJ
+    gdi32.BitBlt.argtypes = [wintypes.HDC] + [ctypes.c_int] * 4 + [
+        wintypes.HDC,
+        ctypes.c_int,
+        ctypes.c_int,
+        wintypes.DWORD,
+    ]
+    gdi32.BitBlt.restype = wintypes.BOOL
+    gdi32.GetDIBits.argtypes = [
+        wintypes.HDC,
+        wintypes.HBITMAP,
+        wintypes.UINT,
+        wintypes.UINT,
+        ctypes.c_void_p,
+        ctypes.c_void_p,
+        wintypes.UINT,
+    ]
+    gdi32.GetDIBits.restype = ctypes.c_int
+    gdi32.DeleteObject.argtypes = [wintypes.HGDIOBJ]
+    gdi32.DeleteDC.argtypes = [wintypes.HDC]
+
+
+def grab_screen(bbox):
+    """
+    Default frame provider for screen triggers: captures `bbox` (left, top, right,
+    bottom, in virtual screen coordinates) from the live screen. Called once per
+    trigger check.
+    On Windows only the bbox is copied (GDI BitBlt), so the cost follows the skill bar
+    area; `ImageGrab.grab` would copy the whole (multi-monitor) desktop and crop it.
+    Like ImageGrab, the thread is switched to per-monitor DPI awareness for the capture,
+    so `bbox` is in physical pixels on scaled displays too.
+    Other platforms fall back to ImageGrab.
+    """
+    if sys.platform != "win32":
+        return ImageGrab.grab(bbox=bbox, all_screens=True)
+
+    left, top, right, bottom = bbox
+    width, height = right - left, bottom - top
+
+    previous_dpi_context = None
+    if SetThreadDpiAwarenessContext:
+        previous_dpi_context = SetThreadDpiAwarenessContext(
+            DPI_AWARENESS_CONTEXT_PER_MONITOR_AWARE
+        )
+    screen_dc = user32.GetDC(None)
+    memory_dc = gdi32.CreateCompatibleDC(screen_dc)
+    bitmap = gdi32.CreateCompatibleBitmap(screen_dc, width, height)
+    previous = gdi32.SelectObject(memory_dc, bitmap)
+    try:
+        if not gdi32.BitBlt(
+            memory_dc, 0, 0, width, height, screen_dc, left, top, SRCCOPY
+        ):
+            raise OSError(f"BitBlt of {bbox} failed")
+
+        # 32-bit top-down (negative height) BGRX pixels
+        header = BITMAPINFOHEADER(
+            biSize=ctypes.sizeof(BITMAPINFOHEADER),
+            biWidth=width,
+            biHeight=-height,
+            biPlanes=1,
+            biBitCount=32,
+        )
+        pixels = ctypes.create_string_buffer(width * height * 4)
+        if not gdi32.GetDIBits(
+            memory_dc, bitmap, 0, height, pixels, ctypes.byref(header), 0
+        ):
+            raise OSError(f"GetDIBits of {bbox} failed")
+    finally:
+        gdi32.SelectObject(memory_dc, previous)
+        gdi32.DeleteObject(bitmap)
+        gdi32.DeleteDC(memory_dc)
+        user32.ReleaseDC(None, screen_dc)
+        if previous_dpi_context:
+            SetThreadDpiAwarenessContext(previous_dpi_context)
+
+    return Image.frombuffer("RGB", (width, height), pixels, "raw", "BGRX", 0, 1)
+
+
+def make_replay_provider(frame_paths):
+    """
+    Returns a frame provider that plays back recorded full-screen PNG frames (one per
+    call, looping) instead of capturing the screen, e.g. to test screen triggers
+    without a display. The frames are decoded once up front.
+    """
+    frames = [Image.open(path).convert("L") for path in frame_paths]
+    if not frames:
+        raise ValueError("No frames to replay.")
+    calls = itertools.count()
+
+    def grab_recorded(bbox):
+        return frames[next(calls) % len(frames)].crop(bbox)
+
+    return grab_recorded
+
+
+def sample_region(image):
+    """
+    Downsamples an image to a TRIGGER_SAMPLE_SIZE grayscale float array in 0..1.
+    """
+    small = image.convert("L").resize(TRIGGER_SAMPLE_SIZE, Image.Resampling.BILINEAR)
+    return np.asarray(small, dtype=np.float32) / 255.0
+
+
+def compile_screen_triggers(triggers):
+    """
+    Prepares the configured screen triggers for matching: one capture box around all
+    regions, each region's box within it, the stacked downsampled "ready" reference
+    icons and thresholds. Triggers whose reference icon cannot be loaded are skipped.
+    Returns None if none are usable.
+    """
+    keys, regions, references, thresholds = [], [], [], []
+
+    for key, (x, y, width, height), path, threshold in triggers:
+        try:
+            with Image.open(path) as reference:
+                references.append(sample_region(reference))
+        except Exception as e:
+            log.warning(
+                "Skipping screen trigger for '%s': cannot load %s: %s", key, path, e
             )
-        except RuntimeError:
-            pass
+            continue
+        keys.append(key)
+        regions.append((x, y, x + width, y + height))
+        thresholds.append(threshold)
+
+    if not keys:
+        return None
+
+    # Skill bar slots sit next to each other, so one grab of their (small) bounding
+    # box replaces one grab per region.
+    left = min(r[0] for r in regions)
+    top = min(r[1] for r in regions)
+    bbox = (left, top, max(r[2] for r in regions), max(r[3] for r in regions))
+
+    return {
+        "keys": keys,
+        "bbox": bbox,
+        "boxes": [(l - left, t - top, r - left, b - top) for l, t, r, b in regions],
+        "references": np.stack(references),
+        "thresholds": np.asarray(thresholds, dtype=np.float32),
+    }
+
+
+def match_screen_triggers(compiled, grab):
+    """
+    Grabs the trigger area once through the frame provider `grab` and compares all
+    regions against their reference icons in one vectorized step.
+    Returns a bool array: True where the region currently looks "ready".
+    """
+    frame = grab(compiled["bbox"])
+    samples = np.stack([sample_region(frame.crop(box)) for box in compiled["boxes"]])
+    difference = np.abs(samples - compiled["references"]).mean(axis=(1, 2))
+    return difference <= compiled["thresholds"]
+
+
+def timer_age(key):
+    """
+    Returns the seconds since the running timer for `key` was started, or None.
+    """
+    with timer_lock:
+        t = active_timers.get(key)
+    if t is None or not t.is_alive():
+        return None
+    return time.monotonic() - t.started_at
+
+
+def run_screen_triggers(compiled, grab, stop_event, rate_hz=TRIGGER_RATE_HZ):
+    """
+    Checks the trigger regions `rate_hz` times per second until `stop_event` is set:
+    - a region that stops looking ready means the skill fired: start its timer, unless
+      a key press already started it within TRIGGER_GRACE seconds.
+    - a region that looks ready while its timer runs longer than TRIGGER_GRACE means
+      the key press missed or the cooldown ended early: cancel the timer.
+    """
+    keys = compiled["keys"]
+    was_ready = None
+    interval = 1.0 / rate_hz
+    next_check = time.perf_counter()
+
+    while not stop_event.is_set():
+        try:
+            ready = match_screen_triggers(compiled, grab)
+        except Exception as e:
+            log.error("Error checking screen triggers: %s", e)
+            ready = was_ready
+
+        if ready is not None and timers_active:
+            for i, key in enumerate(keys):
+                duration = RUNTIME_PLAN.durations.get(key)
+                if duration is None:
+                    continue  # Not a timer of the active profile
+                age = timer_age(key)
+                if ready[i]:
+                    if age is not None and age > TRIGGER_GRACE:
+                        stop_timer(key)
+                elif was_ready is not None and was_ready[i]:
+                    if age is None or age > TRIGGER_GRACE:
+                        start_timer(key, duration)
+        was_ready = ready
+
+        next_check += interval
+        delay = next_check - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            next_check = time.perf_counter()  # Fell behind: don't try to catch up
+
+
+def start_screen_triggers(grab=grab_screen):
+    """
+    Starts the screen trigger thread for SCREEN_TRIGGERS using the frame provider `grab`.
+    Returns the thread's stop event, or None if there is nothing to run.
+    """
+    if not SCREEN_TRIGGERS:
+        return None
+    if np is None:
+        log.warning("Screen triggers need NumPy (pip install numpy); disabled.")
+        return None
+
+    compiled = compile_screen_triggers(SCREEN_TRIGGERS)
+    if compiled is None:
+        return None
+
+    stop_event = threading.Event()
+    threading.Thread(
+        target=run_screen_triggers,
+        args=(compiled, grab, stop_event),
+        name="ScreenTriggers",
+        daemon=True,
+    ).start()
+    log.info("Screen triggers active for: %s", ", ".join(compiled["keys"]))
+    return stop_event
+
+
+def benchmark_screen_triggers(grab, checks=300):
+    """
+    Runs `checks` trigger checks back to back with the frame provider `grab` and
+    returns (checks per second, CPU seconds per check, seconds per capture,
+    list of ready states). The capture time is the part spent inside `grab`.
+    """
+    compiled = compile_screen_triggers(SCREEN_TRIGGERS)
+    if compiled is None:
+        raise ValueError("No usable screen triggers configured.")
+
+    capture = [0.0]
+
+    def timed_grab(bbox):
+        start = time.perf_counter()
+        try:
+            return grab(bbox)
+        finally:
+            capture[0] += time.perf_counter() - start
+
+    states = []
+    wall, cpu = time.perf_counter(), time.process_time()
+    for _ in range(checks):
+        states.append(match_screen_triggers(compiled, timed_grab))
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+
+    return checks / wall, cpu / checks, capture[0] / checks, states
 
 
 # --- 4. HOTKEY & UTILITY FUNCTIONS ---
@@ -536,27 +1409,77 @@ def toggle_hotkeys():
     global timers_active
     timers_active = not timers_active
     status = "ACTIVE" if timers_active else "PAUSED"
-    print(f"--- Hotkeys Toggled: Currently {status} ---")
+    log.info("Hotkeys Toggled: Currently %s", status)
     update_status_indicator()
 
 
+def dispatch_timer_key(key):
+    """
+    Hotkey callback for every timer key. Looks the key up in the RUNTIME_PLAN of the
+    active profile, so switching profiles never requires rebinding hotkeys.
+    """
+    duration = RUNTIME_PLAN.durations.get(key)
+    if duration is not None:
+        start_timer(key, duration)
+
+
+def cycle_profile():
+    """
+    Switches to the next profile in PROFILES (wrapping around).
+    All running timers are stopped, then the prebuilt overlay of the next profile is
+    activated in the main thread.
+    """
+    names = list(PROFILES)
+    if len(names) < 2 or not gui_root:
+        return
+
+    stop_all_timers()
+
+    def switch_in_main_thread():
+        # Pick the next profile here, not on the hook thread: ACTIVE_PROFILE only
+        # changes in the main thread, so quick presses would otherwise all compute
+        # the same target.
+        names = list(PROFILES)
+        next_name = names[(names.index(ACTIVE_PROFILE) + 1) % len(names)]
+        activate_profile(next_name)
+        gui_root.withdraw()
+        log.info("Profile switched to '%s'", next_name)
+
+    try:
+        gui_root.after(0, switch_in_main_thread)
+    except RuntimeError:
+        return
+
+
 def exit_script():
     """
     Immediately terminates the entire Python process (daemon threads and Tkinter loop).
     """
-    print("--- INSTANTLY EXITING SCRIPT (os._exit(0)) ---")
+    if stop_hook_process:
+        stop_hook_process()
+
+    lag = get_loop_lag_percentiles()
+    if lag:
+        log.info(
+            "GUI loop lag (ms): %s",
+            ", ".join(f"{name}={value:.1f}" for name, value in lag.items()),
+        )
+    log.info("INSTANTLY EXITING SCRIPT (os._exit(0))")
+    # os._exit skips all cleanup, so write out the queued log records first
+    stop_logging()
     os._exit(0)
 
 
 def unbind_hotkeys():
     """
-    Removes all dynamically bound timer hotkeys tracked in `hotkey_listeners`.
+    Removes all hotkeys (utility and timer keys) tracked in `hotkey_listeners`.
     """
     global hotkey_listeners
-    # Note: 'keyboard' library remembers *all* hotkeys bound, only need to remove the dynamic ones.
-    for key in hotkey_listeners:
+    # Note: 'keyboard' library remembers *all* hotkeys bound, so every binding made by
+    # setup_hotkeys must be removed by its handle, or it would fire once more per rebind.
+    for handle in hotkey_listeners:
         try:
-            keyboard.remove_hotkey(key)
+            keyboard.remove_hotkey(handle)
         except Exception:
             pass
     hotkey_listeners = []
@@ -564,40 +1487,271 @@ def unbind_hotkeys():
 
 def setup_hotkeys():
     """
-    Removes existing hotkeys, then binds the configured utility keys (F1, F2, F10)
-    and all dynamic timer keys (Q, W, E, etc.) to their respective functions.
+    Removes existing hotkeys, then binds the configured utility keys (F1, F2, F3, F10)
+    and the dynamic timer keys (Q, W, E, etc.) of every profile to `dispatch_timer_key`.
 
-    MODIFICATION: Skip binding if duration is 0 or less.
+    MODIFICATION: Skip binding if duration is 0 or less in every profile.
     """
     unbind_hotkeys()
 
+    if HOOK_MODE == "process":
+        # Keys are read from the hook process ring and looked up by handle_hook_event
+        log.info("Hotkeys handled by the keyboard hook process.")
+        return
+
     # Bind fixed keys using global config variables
     try:
-        keyboard.add_hotkey(CONFIG_KEY_OPEN_GUI, open_config_gui, suppress=True)
-        keyboard.add_hotkey(CONFIG_KEY_TOGGLE_ACTIVE, toggle_hotkeys, suppress=True)
-        keyboard.add_hotkey(CONFIG_KEY_EXIT, exit_script, suppress=True)
+        for utility_key, callback in (
+            (CONFIG_KEY_OPEN_GUI, open_config_gui),
+            (CONFIG_KEY_TOGGLE_ACTIVE, toggle_hotkeys),
+            (CONFIG_KEY_CYCLE_PROFILE, cycle_profile),
+            (CONFIG_KEY_EXIT, exit_script),
+        ):
+            hotkey_listeners.append(
+                keyboard.add_hotkey(utility_key, callback, suppress=True)
+            )
     except Exception as e:
         # Handle cases where the configured utility key might be invalid or reserved
-        print(f"Warning: Could not bind a utility key. Error: {e}")
+        log.warning("Could not bind a utility key. Error: %s", e)
 
-    # Bind dynamic timer keys
-    for key, duration in TIMER_CONFIGS:
-        # --- MODIFICATION: Skip binding hotkey if duration is 0 or less ---
-        if duration <= 0:
-            print(f"Skipping hotkey bind for '{key}' (Duration: {duration:.2f}s)")
-            continue
-        # --------------------------------------------------------------------
+    # Bind the enabled timer keys of all profiles; the runtime plan decides per profile
+    plans = list(PROFILE_PLANS.values())
+    timer_keys = list(dict.fromkeys(key for plan in plans for key in plan.durations))
+
+    # --- MODIFICATION: Skip binding hotkey if duration is 0 or less (in every profile) ---
+    for plan in plans:
+        for key, duration in plan.configs:
+            if key not in timer_keys:
+                log.info("Skipping hotkey bind for '%s' (Duration: %.2fs)", key, duration)
+    # ---------------------------------------------------------------------------------------
 
+    # Bind dynamic timer keys
+    for key in timer_keys:
         try:
-            # Lambda captures current key and duration value
-            keyboard.add_hotkey(key, lambda k=key, d=duration: start_timer(k, d))
-            hotkey_listeners.append(key)
+            # Lambda captures current key; the duration comes from the runtime plan
+            hotkey_listeners.append(
+                keyboard.add_hotkey(key, lambda k=key: dispatch_timer_key(k))
+            )
         except Exception as e:
-            print(
-                f"Warning: Could not bind timer key '{key}'. Is it reserved? Error: {e}"
+            log.warning(
+                "Could not bind timer key '%s'. Is it reserved? Error: %s", key, e
+            )
+
+    log.info("Hotkeys Bound/Rebound. %s for Config.", CONFIG_KEY_OPEN_GUI.upper())
+
+
+def hook_ring_offset(index):
+    """
+    Returns the byte offset of event number `index` in the shared memory ring.
+    """
+    return HOOK_RING_COUNTER.size + (index % HOOK_RING_SLOTS) * HOOK_RING_EVENT.size
+
+
+def run_hook_process(shm_name, wakeup, ready, stop_event):
+    """
+    Entry point of the keyboard hook child process. Installs a global keyboard hook
+    that only timestamps each event and writes it into the shared memory ring.
+    This process runs no timers and no Tk, so the OS hook callback is never delayed
+    by the overlay holding the GIL.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    buf = shm.buf
+    written = 0
+
+    def on_event(event):
+        nonlocal written
+        timestamp = time.perf_counter_ns()
+        offset = hook_ring_offset(written)
+        name = (event.name or "").lower().encode("utf-8")[:23]
+
+        # Fill the slot with sequence 0 (incomplete), then publish its sequence number
+        HOOK_RING_EVENT.pack_into(
+            buf, offset, 0, timestamp, event.event_type == keyboard.KEY_DOWN, name
+        )
+        written += 1
+        HOOK_RING_COUNTER.pack_into(buf, offset, written)
+        HOOK_RING_COUNTER.pack_into(buf, 0, written)
+        wakeup.release()
+
+    keyboard.hook(on_event)
+    ready.set()
+
+    # Exit with the overlay, even if it was killed without stopping us
+    parent = multiprocessing.parent_process()
+    while not stop_event.wait(timeout=1.0):
+        if parent is not None and not parent.is_alive():
+            break
+    keyboard.unhook_all()
+
+
+def consume_hook_ring(shm, wakeup, stopped, handler):
+    """
+    Runs in a daemon thread of the overlay process. Reads every new event from the
+    shared memory ring and passes (key name, timestamp ns, is key down) to `handler`.
+    If the ring overflowed, the oldest unread events are dropped.
+    """
+    buf = shm.buf
+    read = 0
+
+    while not stopped.is_set():
+        wakeup.acquire(timeout=0.5)
+        written = HOOK_RING_COUNTER.unpack_from(buf, 0)[0]
+
+        if written - read > HOOK_RING_SLOTS:
+            dropped = written - read - HOOK_RING_SLOTS
+            log.warning("Keyboard hook ring overflowed, dropped %d events", dropped)
+            read = written - HOOK_RING_SLOTS
+
+        while read < written:
+            sequence, timestamp, is_down, name = HOOK_RING_EVENT.unpack_from(
+                buf, hook_ring_offset(read)
             )
+            if sequence != read + 1:
+                # The slot is still being written; it is picked up on the next wakeup
+                break
+            read += 1
+            try:
+                handler(
+                    name.rstrip(b"\0").decode("utf-8", "replace"), timestamp, is_down
+                )
+            except Exception:
+                # Keep consuming: one failing action must not disable every hotkey
+                log.exception("Error handling key event from the hook process")
 
-    print(f"--- Hotkeys Bound/Rebound. {CONFIG_KEY_OPEN_GUI.upper()} for Config. ---")
+
+def start_hook_process(handler):
+    """
+    Starts the keyboard hook child process and the ring consumer thread that feeds
+    `handler`. Returns a function that stops both and frees the shared memory.
+    """
+    size = HOOK_RING_COUNTER.size + HOOK_RING_SLOTS * HOOK_RING_EVENT.size
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    wakeup = multiprocessing.Semaphore(0)
+    ready = multiprocessing.Event()
+    stop_event = multiprocessing.Event()
+    stopped = threading.Event()
+
+    process = multiprocessing.Process(
+        target=run_hook_process,
+        args=(shm.name, wakeup, ready, stop_event),
+        name="KeyboardHook",
+        daemon=True,
+    )
+    process.start()
+    if not ready.wait(timeout=5.0):
+        log.warning("Keyboard hook process did not report ready in time.")
+
+    consumer = threading.Thread(
+        target=consume_hook_ring,
+        args=(shm, wakeup, stopped, handler),
+        name="HookRingConsumer",
+        daemon=True,
+    )
+    consumer.start()
+
+    def stop():
+        stopped.set()
+        stop_event.set()
+        wakeup.release()
+        # The exit key is dispatched on the consumer thread itself, which can't join itself
+        if threading.current_thread() is not consumer:
+            consumer.join(timeout=1.0)
+        process.join(timeout=1.0)
+        if process.is_alive():
+            process.terminate()
+        shm.close()
+        shm.unlink()
+
+    return stop
+
+
+def handle_hook_event(name, timestamp_ns, is_down):
+    """
+    Dispatches a key event from the hook process the way the in-process hotkeys would.
+    In this mode only single-key hotkeys are supported and utility keys are not
+    suppressed (the hook process never blocks events).
+    Like `keyboard.add_hotkey`, a key does nothing while a modifier is held, so e.g.
+    Ctrl+Q doesn't start the Q timer and Alt+F10 doesn't exit.
+    """
+    if keyboard.is_modifier(name):
+        if is_down:
+            hook_modifiers_held.add(name)
+        else:
+            hook_modifiers_held.discard(name)
+        return
+    if not is_down or hook_modifiers_held:
+        return
+
+    utility_actions = {
+        CONFIG_KEY_OPEN_GUI: open_config_gui,
+        CONFIG_KEY_TOGGLE_ACTIVE: toggle_hotkeys,
+        CONFIG_KEY_CYCLE_PROFILE: cycle_profile,
+        CONFIG_KEY_EXIT: exit_script,
+    }
+    action = utility_actions.get(name)
+    if action:
+        action()
+    else:
+        dispatch_timer_key(name)
+
+
+def benchmark_hook_latency(mode, presses=200, load_threads=4):
+    """
+    Injects `presses` presses of HOOK_BENCH_KEY while `load_threads` busy Python
+    threads compete for the GIL (like timer threads and rendering do), and measures
+    the delay from injection to the hook callback and to dispatch in this process.
+    `mode` is "thread" (in-process hook) or "process" (hook process + ring).
+    Returns {"hook": percentiles, "dispatch": percentiles, "missed": count} in ms.
+    """
+    received = queue.Queue()
+
+    if mode == "process":
+
+        def on_ring_event(name, timestamp_ns, is_down):
+            if is_down and name == HOOK_BENCH_KEY:
+                received.put((timestamp_ns, time.perf_counter_ns()))
+
+        stop = start_hook_process(on_ring_event)
+    else:
+
+        def on_event(event):
+            if event.event_type == keyboard.KEY_DOWN and event.name == HOOK_BENCH_KEY:
+                now = time.perf_counter_ns()
+                received.put((now, now))
+
+        keyboard.hook(on_event)
+        stop = lambda: keyboard.unhook(on_event)
+
+    stop_load = threading.Event()
+
+    def burn_cpu():
+        while not stop_load.is_set():
+            sum(i * i for i in range(2000))
+
+    for _ in range(load_threads):
+        threading.Thread(target=burn_cpu, daemon=True).start()
+
+    hook_ms, dispatch_ms = [], []
+    try:
+        for _ in range(presses):
+            sent = time.perf_counter_ns()
+            keyboard.send(HOOK_BENCH_KEY)
+            try:
+                hooked, dispatched = received.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            hook_ms.append((hooked - sent) / 1e6)
+            dispatch_ms.append((dispatched - sent) / 1e6)
+            time.sleep(0.01)
+    finally:
+        stop_load.set()
+        stop()
+
+    return {
+        "hook": compute_percentiles(hook_ms),
+        "dispatch": compute_percentiles(dispatch_ms),
+        "missed": presses - len(hook_ms),
+    }
 
 
 # --- 5. CONFIGURATION GUI LOGIC ---
@@ -616,12 +1770,30 @@ def open_file_dialog(entry_ref):
         entry_ref.set(file_path)
 
 
+def rebuild_overlay():
+    """
+    Destroys the overlay widgets and icons of every profile and recreates them from the
+    current global configuration. Must run in the main thread.
+    """
+    # Clean up existing GUI elements of every profile
+    destroy_profile_overlays()
+
+    # Recreate everything based on new global config values
+    create_overlay()
+    check_visibility()
+
+
 def apply_and_restart(
-    config_entries, icon_path_entries, utility_key_entries, config_window_ref
+    config_entries,
+    icon_path_entries,
+    utility_key_entries,
+    config_window_ref,
+    profile=None,
 ):
     """
     1. Collects and validates new configurations from the GUI entries.
-    2. Saves the new configuration to the file and updates global variables.
+    2. Saves the new configuration into `profile` (the profile the settings window was
+       opened for; default: the active one) and updates global variables.
     3. Signals all currently running timer threads to stop gracefully.
     4. Destroys the old GUI, recreates the overlay, and rebinds hotkeys in the main thread.
     """
@@ -669,28 +1841,17 @@ def apply_and_restart(
         new_utility_keys[name] = key_value
 
     # 3. Save and Update Global Config (also writes to CONFIG_FILE)
-    save_config(new_configs, new_icon_paths, new_utility_keys)
+    save_config(new_configs, new_icon_paths, new_utility_keys, profile)
 
     # 4. Signal all running timers to stop gracefully
-    with timer_lock:
-        for key, t in active_timers.items():
-            if t and t.is_alive():
-                t.stop_signal = True
+    stop_all_timers()
 
     # 5. Schedule the GUI recreation and hotkey rebind in the main thread
     def cleanup_and_recreate_in_main_thread():
         config_window_ref.destroy()
+        icon_preview_refs.clear()
 
-        # Clean up existing GUI elements
-        for frame in timer_frames.values():
-            frame.destroy()
-        timer_frames.clear()
-        timer_labels.clear()
-        timer_icons.clear()
-
-        # Recreate everything based on new global config values
-        create_overlay()
-        check_visibility()
+        rebuild_overlay()
         setup_hotkeys()
 
     if gui_root:
@@ -701,7 +1862,7 @@ def open_config_gui():
     """
     Creates and displays the dedicated configuration window (on F1 press).
     This window allows users to edit timer hotkeys, durations, icons, and utility hotkeys.
-    It populates the input fields with current global values.
+    It populates the input fields with current global values of the active profile.
     """
     global config_window
     global icon_preview_refs
@@ -710,9 +1871,14 @@ def open_config_gui():
         config_window.lift()
         return
 
+    # Edit (and later save) the profile that is active now, even if the user cycles
+    # profiles while the window is open.
+    profile_name = ACTIVE_PROFILE
+    profile_configs, profile_icon_paths = PROFILES[profile_name]
+
     config_window = tk.Toplevel(gui_root)
-    config_window.title("MHO Timer Settings")
-    config_window.geometry("700x530")
+    config_window.title(f"MHO Timer Settings - Profile: {profile_name}")
+    config_window.geometry("700x565")
     config_window.attributes("-topmost", True)
 
     main_frame = tk.Frame(config_window, padx=10, pady=10)
@@ -727,6 +1893,7 @@ def open_config_gui():
     utility_keys = {
         "open_gui": ("Open Settings Window", CONFIG_KEY_OPEN_GUI),
         "toggle_active": ("Toggle Timers", CONFIG_KEY_TOGGLE_ACTIVE),
+        "cycle_profile": ("Cycle Profile", CONFIG_KEY_CYCLE_PROFILE),
         "exit": ("Exit Application", CONFIG_KEY_EXIT),
     }
 
@@ -766,7 +1933,7 @@ def open_config_gui():
     icon_path_entries = []
     icon_preview_refs = {}
 
-    for i, (key, duration) in enumerate(TIMER_CONFIGS):
+    for i, (key, duration) in enumerate(profile_configs):
         row_num = i + 1
 
         # Key Entry (Column 0)
@@ -780,13 +1947,15 @@ def open_config_gui():
         duration_entry.grid(row=row_num, column=1, padx=5, pady=5)
 
         # Icon Path Entry (Column 2)
-        current_icon_path = ICON_PATHS.get(key, DEFAULT_ICON_PATH)
+        current_icon_path = profile_icon_paths.get(key, DEFAULT_ICON_PATH)
         entry_icon_path = tk.StringVar(value=current_icon_path)
         path_entry = tk.Entry(timer_frame, textvariable=entry_icon_path, width=60)
         path_entry.grid(row=row_num, column=2, padx=5, pady=5)
 
         # Icon Preview (Column 3)
-        photo_image = load_image(key, color=DEFAULT_COLOR)
+        photo_image = load_image(
+            key, color=DEFAULT_COLOR, icon_paths=profile_icon_paths
+        )
         icon_label = tk.Label(
             timer_frame, image=photo_image, width=ICON_SIZE[0], height=ICON_SIZE[1]
         )
@@ -809,7 +1978,11 @@ def open_config_gui():
         config_window,
         text="Save",
         command=lambda: apply_and_restart(
-            config_entries, icon_path_entries, utility_key_entries, config_window
+            config_entries,
+            icon_path_entries,
+            utility_key_entries,
+            config_window,
+            profile_name,
         ),
         font=("Helvetica", 8, "bold"),
     ).pack(pady=18)
@@ -817,19 +1990,116 @@ def open_config_gui():
 
 # --- 6. MAIN EXECUTION ---
 if __name__ == "__main__":
+    # Required for the hook child process in the PyInstaller executable
+    multiprocessing.freeze_support()
+
+    parser = argparse.ArgumentParser(description="MHO Skill Timer")
+    parser.add_argument(
+        "--hook-process",
+        action="store_true",
+        help="run the keyboard hook in a separate process",
+    )
+    parser.add_argument(
+        "--state-file",
+        metavar="PATH",
+        help="publish live timer state to a memory-mapped file (see state_reader.py)",
+    )
+    parser.add_argument(
+        "--trigger-replay",
+        metavar="DIR",
+        help="feed screen triggers from recorded PNG frames in DIR instead of the screen",
+    )
+    parser.add_argument(
+        "--bench-triggers",
+        action="store_true",
+        help="measure screen trigger checks per second (with --trigger-replay), then exit",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="minimum level written to the console and timer.log",
+    )
+    parser.add_argument(
+        "--bench-hook",
+        action="store_true",
+        help="compare in-process and out-of-process hook latency, then exit",
+    )
+    args = parser.parse_args()
+    log.setLevel(args.log_level)
+
+    grab_frame = grab_screen
+    if args.trigger_replay:
+        grab_frame = make_replay_provider(
+            sorted(
+                os.path.join(args.trigger_replay, name)
+                for name in os.listdir(args.trigger_replay)
+                if name.lower().endswith(".png")
+            )
+        )
+
+    if args.bench_triggers:
+        providers = [("replay" if args.trigger_replay else "live", grab_frame)]
+        if args.trigger_replay:
+            # Always measure the live capture too; replay frames are pre-decoded
+            providers.append(("live", grab_screen))
+
+        states = []
+        for provider_name, provider in providers:
+            try:
+                rate, cpu_per_check, capture, provider_states = (
+                    benchmark_screen_triggers(provider)
+                )
+            except Exception as e:
+                print(f"Screen triggers ({provider_name}): unavailable: {e}")
+                continue
+            states = states or provider_states
+            print(
+                f"Screen triggers ({provider_name}): {rate:.0f} checks/s, "
+                f"{cpu_per_check * 1000:.2f} ms CPU per check "
+                f"({cpu_per_check * TRIGGER_RATE_HZ * 100:.1f}% of one core at "
+                f"{TRIGGER_RATE_HZ} Hz), {capture * 1000:.2f} ms capture per check"
+            )
+        for i, ready in enumerate(states[:20]):
+            print(f"  check {i:3d}: " + " ".join("R" if r else "." for r in ready))
+        stop_logging()
+        sys.exit(0)
+
+    if args.bench_hook:
+        for mode in ("thread", "process"):
+            result = benchmark_hook_latency(mode)
+            for stage in ("hook", "dispatch"):
+                print(
+                    f"{mode:>7} {stage:>8} (ms): "
+                    + ", ".join(f"{k}={v:.2f}" for k, v in result[stage].items())
+                )
+            print(f"{mode:>7}   missed: {result['missed']}")
+        stop_logging()
+        sys.exit(0)
 
     # 1. Initialize the GUI (creates overlay and status windows)
+    if args.state_file:
+        open_state_file(args.state_file)
     create_overlay()
 
-    # 2. Setup hotkey listener in a daemon thread
+    # 2. Start sampling the GUI main loop lag and the optional screen triggers
+    sample_loop_lag()
+    start_screen_triggers(grab_frame)
+
+    # 3. Setup hotkey listener in a daemon thread (or the hook process)
+    if args.hook_process:
+        HOOK_MODE = "process"
+        stop_hook_process = start_hook_process(handle_hook_event)
     listener_thread = threading.Thread(target=setup_hotkeys, daemon=True)
     listener_thread.start()
 
     try:
-        # 3. Initial status update
+        # 4. Initial status update
         update_status_indicator()
 
-        # 4. Start the main GUI loop
+        # 5. Start the main GUI loop
         gui_root.mainloop()
     except Exception as e:
-        print(f"\n!!! FATAL ERROR !!!\nDetails: {e}")
+        log.critical("!!! FATAL ERROR !!! Details: %s", e, exc_info=True)
+    finally:
+        stop_logging()